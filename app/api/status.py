@@ -1,22 +1,30 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas
 from ..database import get_db
+from ..utils import etags
+from ..worker.latency import get_latency_stats, get_timeout_count, get_timeouts, target_host
 
 router = APIRouter()
 
 @router.get("/delivery/{delivery_id}", response_model=List[schemas.DeliveryAttempt])
-def get_delivery_status(delivery_id: UUID, db: Session = Depends(get_db)):
+def get_delivery_status(delivery_id: UUID, request: Request, db: Session = Depends(get_db)):
+    # Answer repeat polls from the version stamps without touching the database
+    keys = (etags.delivery_key(delivery_id), etags.ATTEMPTS_KEY)
+    stamps = etags.read_stamps(*keys)
+    cached = etags.not_modified(request, stamps)
+    if cached is not None:
+        return cached
+    
     # First check if delivery exists
-    delivery = crud.get_delivery(db, delivery_id=delivery_id)
-    if delivery is None:
+    if not crud.delivery_exists(db, delivery_id=delivery_id):
         raise HTTPException(status_code=404, detail="Delivery not found")
         
-    attempts = crud.get_delivery_attempts(db, delivery_id=delivery_id)
-    return attempts
+    attempts = crud.get_delivery_attempt_rows(db, delivery_id=delivery_id)
+    return etags.json_response(attempts, etags.seed_stamps(keys, stamps))
 
 @router.get("/subscription/{subscription_id}", response_model=List[schemas.DeliveryAttempt])
 def get_subscription_attempts(subscription_id: UUID, limit: int = 20, db: Session = Depends(get_db)):
@@ -26,4 +34,29 @@ def get_subscription_attempts(subscription_id: UUID, limit: int = 20, db: Sessio
         raise HTTPException(status_code=404, detail="Subscription not found")
         
     attempts = crud.get_subscription_attempts(db, subscription_id=subscription_id, limit=limit)
-    return attempts
\ No newline at end of file
+    return attempts
+
+@router.get("/subscription/{subscription_id}/timeouts", response_model=schemas.TargetTimeouts)
+def get_subscription_timeouts(subscription_id: UUID, db: Session = Depends(get_db)):
+    subscription = crud.get_subscription(db, subscription_id=subscription_id)
+    if subscription is None:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    
+    # Timeouts the next delivery attempt will use
+    connect_timeout, read_timeout = get_timeouts(
+        subscription.target_url,
+        min_timeout=subscription.min_timeout,
+        max_timeout=subscription.max_timeout,
+        store=False
+    )
+    
+    return {
+        "subscription_id": subscription.id,
+        "host": target_host(subscription.target_url),
+        "min_timeout": subscription.min_timeout,
+        "max_timeout": subscription.max_timeout,
+        "connect_timeout": connect_timeout,
+        "read_timeout": read_timeout,
+        "recent_timeouts": get_timeout_count(subscription.target_url),
+        "latency": get_latency_stats(subscription.target_url)
+    }
\ No newline at end of file
@@ -1,34 +1,65 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from .. import crud, schemas
 from ..database import get_db
+from ..utils import etags
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Subscription)
 def create_subscription(subscription: schemas.SubscriptionCreate, db: Session = Depends(get_db)):
-    return crud.create_subscription(db=db, subscription=subscription)
+    db_subscription = crud.create_subscription(db=db, subscription=subscription)
+    etags.touch(etags.SUBSCRIPTIONS_KEY)
+    return db_subscription
 
 @router.get("/{subscription_id}", response_model=schemas.Subscription)
-def read_subscription(subscription_id: UUID, db: Session = Depends(get_db)):
-    db_subscription = crud.get_subscription(db, subscription_id=subscription_id)
+def read_subscription(subscription_id: UUID, request: Request, db: Session = Depends(get_db)):
+    # Answer repeat polls from the version stamp without touching the database
+    keys = (etags.subscription_key(subscription_id),)
+    stamps = etags.read_stamps(*keys)
+    cached = etags.not_modified(request, stamps)
+    if cached is not None:
+        return cached
+    
+    db_subscription = crud.get_subscription_row(db, subscription_id=subscription_id)
     if db_subscription is None:
         raise HTTPException(status_code=404, detail="Subscription not found")
-    return db_subscription
+    return etags.json_response(db_subscription, etags.seed_stamps(keys, stamps))
 
 @router.get("/", response_model=List[schemas.Subscription])
-def read_subscriptions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    subscriptions = crud.get_subscriptions(db, skip=skip, limit=limit)
-    return subscriptions
+def read_subscriptions(request: Request, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    keys = (etags.SUBSCRIPTIONS_KEY,)
+    stamps = etags.read_stamps(*keys)
+    cached = etags.not_modified(request, stamps)
+    if cached is not None:
+        return cached
+    
+    subscriptions = crud.get_subscription_rows(db, skip=skip, limit=limit)
+    return etags.json_response(subscriptions, etags.seed_stamps(keys, stamps))
 
 @router.put("/{subscription_id}", response_model=schemas.Subscription)
 def update_subscription(subscription_id: UUID, subscription: schemas.SubscriptionUpdate, db: Session = Depends(get_db)):
+    # Validate timeout bounds against the stored values they are combined with
+    update_data = subscription.dict(exclude_unset=True)
+    if "min_timeout" in update_data or "max_timeout" in update_data:
+        current = crud.get_subscription(db, subscription_id=subscription_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Subscription not found")
+        try:
+            schemas.check_timeout_bounds(
+                update_data.get("min_timeout", current.min_timeout),
+                update_data.get("max_timeout", current.max_timeout)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
     db_subscription = crud.update_subscription(db, subscription_id=subscription_id, subscription=subscription)
     if db_subscription is None:
         raise HTTPException(status_code=404, detail="Subscription not found")
+    etags.touch(etags.SUBSCRIPTIONS_KEY, etags.subscription_key(subscription_id))
     return db_subscription
 
 @router.delete("/{subscription_id}", response_model=schemas.Subscription)
@@ -36,4 +67,6 @@ def delete_subscription(subscription_id: UUID, db: Session = Depends(get_db)):
     db_subscription = crud.delete_subscription(db, subscription_id=subscription_id)
     if db_subscription is None:
         raise HTTPException(status_code=404, detail="Subscription not found")
+    etags.touch(etags.SUBSCRIPTIONS_KEY)
+    etags.forget(etags.subscription_key(subscription_id))
     return db_subscription
\ No newline at end of file
@@ -4,12 +4,37 @@ from uuid import UUID
 import json
 from . import models, schemas
 
+# Columns read by the fast JSON read path, in the same order as the response schemas
+SUBSCRIPTION_COLUMNS = (
+    models.Subscription.target_url,
+    models.Subscription.secret,
+    models.Subscription.event_types,
+    models.Subscription.min_timeout,
+    models.Subscription.max_timeout,
+    models.Subscription.id,
+    models.Subscription.created_at,
+    models.Subscription.is_active
+)
+
+DELIVERY_ATTEMPT_COLUMNS = (
+    models.DeliveryAttempt.delivery_id,
+    models.DeliveryAttempt.subscription_id,
+    models.DeliveryAttempt.attempt_number,
+    models.DeliveryAttempt.status_code,
+    models.DeliveryAttempt.success,
+    models.DeliveryAttempt.error,
+    models.DeliveryAttempt.id,
+    models.DeliveryAttempt.timestamp
+)
+
 # Subscription CRUD
 def create_subscription(db: Session, subscription: schemas.SubscriptionCreate):
     db_subscription = models.Subscription(
         target_url=str(subscription.target_url),
         secret=subscription.secret,
-        event_types=subscription.event_types
+        event_types=subscription.event_types,
+        min_timeout=subscription.min_timeout,
+        max_timeout=subscription.max_timeout
     )
     db.add(db_subscription)
     db.commit()
@@ -22,6 +47,15 @@ def get_subscription(db: Session, subscription_id: UUID):
 def get_subscriptions(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Subscription).offset(skip).limit(limit).all()
 
+def get_subscription_row(db: Session, subscription_id: UUID):
+    """Get a subscription as a plain dict, skipping ORM object construction"""
+    row = db.query(*SUBSCRIPTION_COLUMNS).filter(models.Subscription.id == subscription_id).first()
+    return row._asdict() if row else None
+
+def get_subscription_rows(db: Session, skip: int = 0, limit: int = 100):
+    rows = db.query(*SUBSCRIPTION_COLUMNS).offset(skip).limit(limit).all()
+    return [row._asdict() for row in rows]
+
 def update_subscription(db: Session, subscription_id: UUID, subscription: schemas.SubscriptionUpdate):
     db_subscription = db.query(models.Subscription).filter(models.Subscription.id == subscription_id).first()
     
@@ -60,6 +94,9 @@ def create_delivery(db: Session, delivery: schemas.DeliveryCreate):
 def get_delivery(db: Session, delivery_id: UUID):
     return db.query(models.Delivery).filter(models.Delivery.id == delivery_id).first()
 
+def delivery_exists(db: Session, delivery_id: UUID) -> bool:
+    return db.query(models.Delivery.id).filter(models.Delivery.id == delivery_id).first() is not None
+
 def update_delivery_status(db: Session, delivery_id: UUID, status: str):
     db_delivery = db.query(models.Delivery).filter(models.Delivery.id == delivery_id).first()
     if db_delivery:
@@ -88,6 +125,12 @@ def get_delivery_attempts(db: Session, delivery_id: UUID):
         models.DeliveryAttempt.delivery_id == delivery_id
     ).order_by(desc(models.DeliveryAttempt.timestamp)).all()
 
+def get_delivery_attempt_rows(db: Session, delivery_id: UUID):
+    rows = db.query(*DELIVERY_ATTEMPT_COLUMNS).filter(
+        models.DeliveryAttempt.delivery_id == delivery_id
+    ).order_by(desc(models.DeliveryAttempt.timestamp)).all()
+    return [row._asdict() for row in rows]
+
 def get_subscription_attempts(db: Session, subscription_id: UUID, limit: int = 20):
     return db.query(models.DeliveryAttempt).filter(
         models.DeliveryAttempt.subscription_id == subscription_id
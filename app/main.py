@@ -1,11 +1,15 @@
 import os
+import time
+from datetime import datetime
 from fastapi import FastAPI, Depends
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
-from rq import Queue
 from .api import subscriptions, webhooks, status
 from . import models
 from .database import engine, SessionLocal, get_db
+from .health import HealthMonitor, PROBE_INTERVAL
+from .utils import etags
 import redis
 
 # Create database tables
@@ -15,6 +19,9 @@ models.Base.metadata.create_all(bind=engine)
 REDIS_URL = os.getenv("REDIS_URL")
 redis_client = redis.from_url(REDIS_URL)
 
+# Background health probes
+health_monitor = HealthMonitor(redis_client)
+
 app = FastAPI(
     title="Webhook Delivery Service",
     description="A service for receiving, queueing, and delivering webhooks",
@@ -41,55 +48,57 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    # Check database connection
-    db = SessionLocal()
-    try:
-        # Import text from sqlalchemy
-        from sqlalchemy import text
-        
-        # Execute simple query to check DB connection
-        db.execute(text("SELECT 1"))
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
-    finally:
-        db.close()
-    
-    # Check Redis connection
-    try:
-        redis_client.ping()
-        redis_status = "healthy"
-    except Exception as e:
-        redis_status = f"unhealthy: {str(e)}"
-    
+    # Served from the background probes, no DB or Redis round trip here
+    return {
+        "status": "up",
+        "database": health_monitor.status("database"),
+        "redis": health_monitor.status("redis"),
+        "checks": health_monitor.snapshot("database", "redis", "queue", "workers")
+    }
+
+@app.get("/health/live")
+def liveness_check():
+    """Liveness only says the process is serving requests; dependencies don't matter here."""
     return {
         "status": "up",
-        "database": db_status,
-        "redis": redis_status
+        "uptime_seconds": round(time.time() - health_monitor.started_at, 3)
     }
 
+@app.get("/health/ready")
+def readiness_check():
+    """Ready when the database and Redis were healthy on a recent probe."""
+    checks = health_monitor.snapshot("database", "redis")
+    ready = health_monitor.is_ready("database", "redis")
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not ready",
+            **checks
+        }
+    )
+
 @app.get("/health/worker")
 def worker_health_check():
     """Check if worker processes are running and processing jobs."""
-    try:
-        # Check if workers are active
-        workers = Queue(connection=redis_client).workers
-        worker_count = len(workers)
-        
-        # Check queue statistics
-        queue = Queue(connection=redis_client)
-        queue_length = len(queue)
-        
-        return {
-            "status": "healthy" if worker_count > 0 else "unhealthy",
-            "workers": worker_count,
-            "queue_size": queue_length
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "error": str(e)
-        }
+    checks = health_monitor.snapshot("workers", "queue")
+    
+    # A probe that failed, or hasn't run recently, is reported as an error like before
+    for name in ("workers", "queue"):
+        status = health_monitor.status(name)
+        if status == "unknown" or status.startswith("unhealthy:"):
+            return {
+                "status": "unhealthy",
+                "error": f"{name}: {status}",
+                "checks": checks
+            }
+    
+    worker_count = checks["workers"]["workers"]
+    return {
+        "status": "healthy" if worker_count > 0 else "unhealthy",
+        "workers": worker_count,
+        "queue_size": checks["queue"]["queued"],
+        "checks": checks
+    }
 
 # Schedule periodic task to clean up old logs
 @app.on_event("startup")
@@ -105,7 +114,18 @@ async def startup_event():
         db = SessionLocal()
         try:
             delete_old_attempts(db, hours=72)
+            etags.touch(etags.ATTEMPTS_KEY)
         finally:
             db.close()
     
+    # Refresh health snapshots, starting right away so probes have data on boot
+    scheduler.add_job(
+        health_monitor.probe_all,
+        'interval',
+        seconds=PROBE_INTERVAL,
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True
+    )
+    
     scheduler.start()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, JSON
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -15,6 +15,8 @@ class Subscription(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
     event_types = Column(JSON, nullable=True)
+    min_timeout = Column(Float, nullable=True)  # seconds, bounds the adaptive delivery timeout
+    max_timeout = Column(Float, nullable=True)
 
 class Delivery(Base):
     __tablename__ = "deliveries"
@@ -1,12 +1,28 @@
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 from uuid import UUID
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, model_validator
+
+from .worker.latency import DEFAULT_MAX_TIMEOUT, DEFAULT_MIN_TIMEOUT
+
+def check_timeout_bounds(min_timeout: Optional[float], max_timeout: Optional[float]):
+    """Reject bounds where the effective min timeout is above the effective max."""
+    lower = min_timeout or DEFAULT_MIN_TIMEOUT
+    upper = max_timeout or DEFAULT_MAX_TIMEOUT
+    if lower > upper:
+        raise ValueError(f"min_timeout ({lower}) must not be greater than max_timeout ({upper})")
 
 class SubscriptionBase(BaseModel):
     target_url: HttpUrl
     secret: Optional[str] = None
     event_types: Optional[List[str]] = None
+    min_timeout: Optional[float] = Field(None, gt=0)
+    max_timeout: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def validate_timeouts(self):
+        check_timeout_bounds(self.min_timeout, self.max_timeout)
+        return self
 
 class SubscriptionCreate(SubscriptionBase):
     pass
@@ -16,6 +32,15 @@ class SubscriptionUpdate(BaseModel):
     secret: Optional[str] = None
     is_active: Optional[bool] = None
     event_types: Optional[List[str]] = None
+    min_timeout: Optional[float] = Field(None, gt=0)
+    max_timeout: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def validate_timeouts(self):
+        # A single bound is checked against the stored one by the route
+        if self.min_timeout is not None and self.max_timeout is not None:
+            check_timeout_bounds(self.min_timeout, self.max_timeout)
+        return self
 
 class Subscription(SubscriptionBase):
     id: UUID
@@ -62,4 +87,20 @@ class DeliveryAttempt(DeliveryAttemptBase):
 
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class LatencyStats(BaseModel):
+    samples: int
+    p50: float
+    p90: float
+    p99: float
+
+class TargetTimeouts(BaseModel):
+    subscription_id: UUID
+    host: str
+    min_timeout: Optional[float] = None
+    max_timeout: Optional[float] = None
+    connect_timeout: float
+    read_timeout: float
+    recent_timeouts: int = 0
+    latency: Optional[LatencyStats] = None
\ No newline at end of file
@@ -0,0 +1,4 @@
+from redis import Redis
+
+# Redis connection for caching, shared by the API and the workers
+cache_redis = Redis(host='redis', port=6379, db=1)
@@ -0,0 +1,124 @@
+import time
+from datetime import timezone
+from email.utils import formatdate, parsedate_to_datetime
+from redis import RedisError
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+from .cache import cache_redis
+
+# Bounds how long a missed bump can keep serving a stale validator
+STAMP_TTL = 3600
+
+SUBSCRIPTIONS_KEY = "version:subscriptions"
+ATTEMPTS_KEY = "version:attempts"  # bumped when old attempts are purged
+
+def subscription_key(subscription_id) -> str:
+    return f"version:subscription:{subscription_id}"
+
+def delivery_key(delivery_id) -> str:
+    return f"version:delivery:{delivery_id}"
+
+def touch(*keys):
+    """Record that the resources behind these keys just changed."""
+    stamp = time.time_ns()
+    try:
+        pipe = cache_redis.pipeline()
+        for key in keys:
+            pipe.set(key, stamp, ex=STAMP_TTL)
+        pipe.execute()
+    except RedisError:
+        pass
+
+def forget(*keys):
+    """Drop the stamps for resources that no longer exist."""
+    try:
+        cache_redis.delete(*keys)
+    except RedisError:
+        pass
+
+def read_stamps(*keys):
+    """
+    Get the version stamps for the given keys without creating any.
+
+    Must be called before the rows are read, so a change that lands while the
+    response is being built always produces a newer stamp than the one served.
+
+    Returns:
+        List of stamps with None for missing keys, or None if Redis is unavailable
+    """
+    try:
+        return [int(s) if s is not None else None for s in cache_redis.mget(keys)]
+    except RedisError:
+        return None
+
+def seed_stamps(keys, stamps):
+    """
+    Fill in the stamps that read_stamps found missing, once the rows are known to exist.
+
+    Returns:
+        Complete list of stamps, or None if a concurrent change beat us to a
+        missing key and the rows just read may be older than its stamp
+    """
+    if stamps is None or None not in stamps:
+        return stamps
+
+    now = time.time_ns()
+    try:
+        pipe = cache_redis.pipeline()
+        for key, stamp in zip(keys, stamps):
+            if stamp is None:
+                pipe.set(key, now, ex=STAMP_TTL, nx=True)
+        if not all(pipe.execute()):
+            return None
+    except RedisError:
+        return None
+    return [now if s is None else s for s in stamps]
+
+def _same_second(stamp, now) -> bool:
+    return stamp // 10**9 == now // 10**9
+
+def _validators(stamps, now):
+    headers = {"ETag": '"' + "-".join(format(s, "x") for s in stamps) + '"'}
+    # Last-Modified only has second precision, so it is left out until the
+    # second of the last change is over. Otherwise another change in the same
+    # second would look unmodified to If-Modified-Since.
+    if not _same_second(max(stamps), now):
+        headers["Last-Modified"] = formatdate(max(stamps) // 10**9, usegmt=True)
+    return headers
+
+def _is_not_modified(request: Request, stamps, headers, now) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or headers["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        if _same_second(max(stamps), now):
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return max(stamps) // 10**9 <= since.timestamp()
+
+    return False
+
+def not_modified(request: Request, stamps):
+    """Return a 304 response if the client's cached copy is still current, else None."""
+    if stamps is None or None in stamps:
+        return None
+
+    now = time.time_ns()
+    headers = _validators(stamps, now)
+    if _is_not_modified(request, stamps, headers, now):
+        return Response(status_code=304, headers=headers)
+    return None
+
+def json_response(content, stamps):
+    """Serialize plain rows with orjson and attach ETag/Last-Modified validators."""
+    headers = _validators(stamps, time.time_ns()) if stamps is not None else None
+    return ORJSONResponse(content=content, headers=headers)
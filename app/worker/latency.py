@@ -0,0 +1,190 @@
+from urllib.parse import urlparse
+from redis import RedisError
+
+from ..utils.cache import cache_redis
+
+# Latency sampling settings
+SAMPLE_WINDOW = 200  # most recent response times kept per host
+MIN_SAMPLES = 10  # below this we don't trust the distribution yet
+SAMPLE_TTL = 7 * 24 * 3600  # forget hosts that haven't been contacted in a week
+OUTCOME_WINDOW = 20  # most recent deliveries checked for timeouts
+TIMEOUT_SHARE = 0.1  # at or above this share of timeouts the budget grows
+
+# Timeout budget settings (seconds)
+DEFAULT_MIN_TIMEOUT = 1.0
+DEFAULT_MAX_TIMEOUT = 10.0
+READ_HEADROOM = 2.0  # read timeout = p99 * headroom
+CONNECT_HEADROOM = 3.0  # connect timeout = p50 * headroom
+MAX_CONNECT_TIMEOUT = 5.0
+MAX_GROWTH = 1.5  # read timeout may grow at most 50% from one delivery to the next
+
+def target_host(target_url: str) -> str:
+    """Return the host[:port] that latency is tracked under."""
+    return urlparse(target_url).netloc.lower()
+
+def _sample_key(host: str) -> str:
+    return f"latency:{host}"
+
+def _outcome_key(host: str) -> str:
+    return f"latency:outcomes:{host}"
+
+def _budget_key(host: str, lower: float, upper: float) -> str:
+    # Subscriptions on the same host may have different bounds, so each pair
+    # of bounds grows from its own base
+    return f"latency:budget:{host}:{lower}:{upper}"
+
+def _push(pipe, key: str, value, window: int):
+    pipe.lpush(key, value)
+    pipe.ltrim(key, 0, window - 1)
+    pipe.expire(key, SAMPLE_TTL)
+
+def _record(target_url: str, seconds: float = None):
+    host = target_host(target_url)
+    try:
+        pipe = cache_redis.pipeline()
+        if seconds is not None:
+            _push(pipe, _sample_key(host), round(seconds, 4), SAMPLE_WINDOW)
+        _push(pipe, _outcome_key(host), 0 if seconds is not None else 1, OUTCOME_WINDOW)
+        pipe.execute()
+    except RedisError:
+        # Losing a sample is fine, losing the delivery is not
+        pass
+
+def record_latency(target_url: str, seconds: float):
+    """Record the response time of a request that got an answer."""
+    _record(target_url, seconds)
+
+def record_timeout(target_url: str):
+    """
+    Record a request that timed out.
+
+    Timeouts are censored samples: we only know the response would have taken
+    longer, so they never enter the response times. Instead they count towards
+    the host's recent timeout share, which grows the budget step by step.
+    """
+    _record(target_url)
+
+def _percentile(samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, int(round(pct / 100 * len(samples))) - 1)
+    return samples[min(index, len(samples) - 1)]
+
+def _clamp(value, lower, upper):
+    return max(lower, min(value, upper))
+
+def _latency_stats(raw):
+    if len(raw) < MIN_SAMPLES:
+        return None
+
+    samples = sorted(float(s) for s in raw)
+    return {
+        "samples": len(samples),
+        "p50": _percentile(samples, 50),
+        "p90": _percentile(samples, 90),
+        "p99": _percentile(samples, 99)
+    }
+
+def _timeout_share(raw) -> float:
+    if not raw:
+        return 0.0
+    return sum(int(o) for o in raw) / len(raw)
+
+def get_latency_stats(target_url: str):
+    """Get the learned latency percentiles for the target host, or None if too few samples."""
+    try:
+        raw = cache_redis.lrange(_sample_key(target_host(target_url)), 0, -1)
+    except RedisError:
+        return None
+    return _latency_stats(raw)
+
+def get_timeout_count(target_url: str) -> int:
+    """Number of timed out requests among the host's recent deliveries."""
+    try:
+        raw = cache_redis.lrange(_outcome_key(target_host(target_url)), 0, -1)
+    except RedisError:
+        return 0
+    return sum(int(o) for o in raw)
+
+def _bounds(min_timeout: float = None, max_timeout: float = None):
+    return (min_timeout or DEFAULT_MIN_TIMEOUT, max_timeout or DEFAULT_MAX_TIMEOUT)
+
+def compute_timeouts(stats, min_timeout: float = None, max_timeout: float = None,
+                     previous_read: float = None, outcomes=()):
+    """
+    Compute (connect, read) timeouts from latency stats.
+
+    Args:
+        stats: Result of get_latency_stats, or None if there's too little history
+        min_timeout: Lower bound configured on the subscription
+        max_timeout: Upper bound configured on the subscription
+        previous_read: Read timeout handed out for the previous delivery, if any
+        outcomes: The host's recent delivery outcomes, newest first (1 = timed out)
+
+    Returns:
+        Tuple of (connect_timeout, read_timeout) in seconds
+    """
+    lower, upper = _bounds(min_timeout, max_timeout)
+
+    # Not enough history yet: be generous so new targets aren't failed spuriously
+    if stats is None:
+        return (_clamp(MAX_CONNECT_TIMEOUT, lower, upper), upper)
+
+    connect_timeout = _clamp(stats["p50"] * CONNECT_HEADROOM, lower, min(upper, MAX_CONNECT_TIMEOUT))
+    read_timeout = stats["p99"] * READ_HEADROOM
+
+    if previous_read is not None:
+        if _timeout_share(outcomes) >= TIMEOUT_SHARE:
+            # The host got slower than its response times say: the answers we
+            # are waiting for never arrive, so grow a step towards max_timeout
+            # while it keeps timing out, and hold once it answers again until
+            # the timeouts leave the window and the new response times take over
+            if int(outcomes[0]):
+                read_timeout = previous_read * MAX_GROWTH
+            else:
+                read_timeout = previous_read
+        else:
+            # Shrink immediately, but only grow a step at a time
+            read_timeout = min(read_timeout, previous_read * MAX_GROWTH)
+
+    return (connect_timeout, _clamp(read_timeout, lower, upper))
+
+def get_timeouts(target_url: str, min_timeout: float = None, max_timeout: float = None, store: bool = True):
+    """
+    Compute (connect, read) timeouts for a delivery to the target URL.
+
+    Args:
+        target_url: The subscription target URL
+        min_timeout: Lower bound configured on the subscription
+        max_timeout: Upper bound configured on the subscription
+        store: Remember the read timeout as the base for the next growth step
+
+    Returns:
+        Tuple of (connect_timeout, read_timeout) in seconds
+    """
+    host = target_host(target_url)
+    budget_key = _budget_key(host, *_bounds(min_timeout, max_timeout))
+    try:
+        pipe = cache_redis.pipeline()
+        pipe.lrange(_sample_key(host), 0, -1)
+        pipe.lrange(_outcome_key(host), 0, -1)
+        pipe.get(budget_key)
+        raw, outcomes, previous_read = pipe.execute()
+    except RedisError:
+        raw, outcomes, previous_read = [], [], None
+
+    stats = _latency_stats(raw)
+    connect_timeout, read_timeout = compute_timeouts(
+        stats,
+        min_timeout=min_timeout,
+        max_timeout=max_timeout,
+        previous_read=float(previous_read) if previous_read is not None and stats is not None else None,
+        outcomes=outcomes
+    )
+
+    if store and stats is not None:
+        try:
+            cache_redis.setex(budget_key, SAMPLE_TTL, read_timeout)
+        except RedisError:
+            pass
+
+    return (connect_timeout, read_timeout)
@@ -8,11 +8,12 @@ from sqlalchemy.orm import Session
 
 from .. import crud, schemas
 from ..database import SessionLocal
+from ..utils import etags
+from ..utils.cache import cache_redis
 from ..utils.logging import log_delivery_attempt
+from .latency import get_timeouts, record_latency, record_timeout
 from datetime import timedelta
 
-# Redis connection for caching
-cache_redis = Redis(host='redis', port=6379, db=1)
 CACHE_TTL = 300  # 5 minutes
 
 # Redis connection
@@ -42,7 +43,9 @@ def get_cached_subscription(db, subscription_id):
             "target_url": subscription.target_url,
             "secret": subscription.secret,
             "is_active": subscription.is_active,
-            "event_types": subscription.event_types
+            "event_types": subscription.event_types,
+            "min_timeout": subscription.min_timeout,
+            "max_timeout": subscription.max_timeout
         }
         cache_redis.setex(
             cache_key, 
@@ -75,6 +78,13 @@ def deliver_webhook(delivery_id: str, attempt: int = 1):
         target_url = subscription.target_url
         payload = delivery.payload
         
+        # Timeouts learned from the target's observed response times
+        connect_timeout, read_timeout = get_timeouts(
+            target_url,
+            min_timeout=subscription.min_timeout,
+            max_timeout=subscription.max_timeout
+        )
+        
         # Make the HTTP request
         try:
             headers = {
@@ -91,8 +101,9 @@ def deliver_webhook(delivery_id: str, attempt: int = 1):
                 target_url,
                 json=payload,
                 headers=headers,
-                timeout=10  # 10 seconds timeout
+                timeout=(connect_timeout, read_timeout)
             )
+            record_latency(target_url, response.elapsed.total_seconds())
             
             # Log the attempt
             success = 200 <= response.status_code < 300
@@ -105,6 +116,7 @@ def deliver_webhook(delivery_id: str, attempt: int = 1):
                 error=None if success else response.text[:255]  # Truncate if too long
             )
             crud.create_delivery_attempt(db, attempt_data)
+            etags.touch(etags.delivery_key(delivery.id))
             
             # Log to console/file
             log_delivery_attempt(
@@ -140,6 +152,9 @@ def deliver_webhook(delivery_id: str, attempt: int = 1):
             }
             
         except requests.RequestException as e:
+            if isinstance(e, requests.ReadTimeout):
+                record_timeout(target_url)
+            
             # Log failed attempt
             attempt_data = schemas.DeliveryAttemptCreate(
                 delivery_id=delivery.id,
@@ -150,6 +165,7 @@ def deliver_webhook(delivery_id: str, attempt: int = 1):
                 error=str(e)[:255]  # Truncate if too long
             )
             crud.create_delivery_attempt(db, attempt_data)
+            etags.touch(etags.delivery_key(delivery.id))
             
             # Log to console/file
             log_delivery_attempt(
@@ -165,7 +181,7 @@ def deliver_webhook(delivery_id: str, attempt: int = 1):
             if attempt < MAX_ATTEMPTS:
                 delay = RETRY_INTERVALS[attempt - 1]
                 queue.enqueue_in(
-                    time.timedelta(seconds=delay),
+                    timedelta(seconds=delay),
                     deliver_webhook,
                     delivery_id,
                     attempt + 1
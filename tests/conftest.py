@@ -0,0 +1,6 @@
+import os
+
+# The app modules build their engine and Redis clients at import time.
+# Neither connects until first use, so these only need to be parseable.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
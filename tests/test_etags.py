@@ -0,0 +1,75 @@
+from email.utils import formatdate
+
+from starlette.requests import Request
+
+from app.utils import etags
+
+SECOND = 10**9
+
+
+def make_request(**headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    })
+
+
+def check(request, stamps, now):
+    return etags._is_not_modified(request, stamps, etags._validators(stamps, now), now)
+
+
+def test_etag_match_is_not_modified():
+    stamps = [5 * SECOND]
+    etag = etags._validators(stamps, 10 * SECOND)["ETag"]
+    assert check(make_request(if_none_match=etag), stamps, 10 * SECOND)
+    assert check(make_request(if_none_match=f"W/{etag}"), stamps, 10 * SECOND)
+    assert check(make_request(if_none_match=f'"other", {etag}'), stamps, 10 * SECOND)
+
+
+def test_etag_mismatch_is_modified():
+    assert not check(make_request(if_none_match='"other"'), [5 * SECOND], 10 * SECOND)
+
+
+def test_if_none_match_takes_precedence():
+    request = make_request(if_none_match='"other"', if_modified_since=formatdate(100, usegmt=True))
+    assert not check(request, [5 * SECOND], 10 * SECOND)
+
+
+def test_last_modified_withheld_during_change_second():
+    stamp = 5 * SECOND + 200
+    assert "Last-Modified" not in etags._validators([stamp], 5 * SECOND + 900)
+    assert etags._validators([stamp], 6 * SECOND)["Last-Modified"] == formatdate(5, usegmt=True)
+
+
+def test_if_modified_since_after_change():
+    request = make_request(if_modified_since=formatdate(5, usegmt=True))
+    assert check(request, [5 * SECOND + 200], 7 * SECOND)
+
+
+def test_if_modified_since_before_change():
+    request = make_request(if_modified_since=formatdate(4, usegmt=True))
+    assert not check(request, [5 * SECOND + 200], 7 * SECOND)
+
+
+def test_if_modified_since_same_second_as_change():
+    # The change may have landed after the client's copy was built
+    request = make_request(if_modified_since=formatdate(5, usegmt=True))
+    assert not check(request, [5 * SECOND + 900], 5 * SECOND + 950)
+
+
+def test_invalid_if_modified_since_is_modified():
+    assert not check(make_request(if_modified_since="yesterday"), [5 * SECOND], 7 * SECOND)
+
+
+def test_missing_stamp_is_never_not_modified():
+    request = make_request(if_none_match="*")
+    assert etags.not_modified(request, [None]) is None
+    assert etags.not_modified(request, [5 * SECOND, None]) is None
+    assert etags.not_modified(request, None) is None
+
+
+def test_seed_keeps_complete_stamps():
+    assert etags.seed_stamps(("a",), [5]) == [5]
+    assert etags.seed_stamps(("a",), None) is None
@@ -0,0 +1,57 @@
+import redis
+
+from app import health
+from app.health import HealthMonitor
+
+
+def make_monitor():
+    # Neither redis.Redis nor rq.Queue connect until used
+    return HealthMonitor(redis.Redis())
+
+
+def age(monitor, name, seconds):
+    monitor._checks[name]["checked_at"] -= seconds
+
+
+def test_unprobed_check_is_unknown_and_not_ready():
+    monitor = make_monitor()
+    assert monitor.snapshot("database")["database"]["status"] == "unknown"
+    assert monitor.status("database") == "unknown"
+    assert not monitor.is_ready("database")
+
+
+def test_fresh_healthy_checks_are_ready():
+    monitor = make_monitor()
+    monitor._store("database", "healthy")
+    monitor._store("redis", "healthy")
+    snapshot = monitor.snapshot("database", "redis")
+    assert snapshot["database"]["age_seconds"] < 1
+    assert not snapshot["database"]["stale"]
+    assert monitor.is_ready("database", "redis")
+    assert monitor.status("database") == "healthy"
+
+
+def test_stale_check_is_not_ready():
+    monitor = make_monitor()
+    monitor._store("database", "healthy")
+    monitor._store("redis", "healthy")
+    age(monitor, "redis", health.STALE_AFTER + 1)
+    assert monitor.snapshot("redis")["redis"]["stale"]
+    assert not monitor.is_ready("database", "redis")
+    assert monitor.status("redis").startswith("unhealthy:")
+
+
+def test_unhealthy_check_is_not_ready():
+    monitor = make_monitor()
+    monitor._store("database", "unhealthy: connection refused")
+    assert not monitor.is_ready("database")
+    assert monitor.status("database") == "unhealthy: connection refused"
+
+
+def test_snapshot_keeps_check_details():
+    monitor = make_monitor()
+    monitor._store("queue", "healthy", queued=3, scheduled=2)
+    check = monitor.snapshot()["queue"]
+    assert check["queued"] == 3
+    assert check["scheduled"] == 2
+    assert "checked_at" not in check
@@ -0,0 +1,113 @@
+from app.worker import latency
+from app.worker.latency import _latency_stats, _percentile, compute_timeouts
+
+
+def stats_for(samples):
+    return _latency_stats([str(s) for s in samples])
+
+
+def test_percentile_nearest_rank():
+    samples = sorted(float(i) for i in range(1, 101))
+    assert _percentile(samples, 50) == 50.0
+    assert _percentile(samples, 99) == 99.0
+    assert _percentile([0.2], 99) == 0.2
+
+
+def test_too_few_samples_has_no_stats():
+    assert stats_for([0.05] * (latency.MIN_SAMPLES - 1)) is None
+
+
+def test_new_target_gets_full_budget():
+    connect, read = compute_timeouts(None, min_timeout=0.5, max_timeout=15)
+    assert read == 15
+    assert connect == latency.MAX_CONNECT_TIMEOUT
+
+
+def test_fast_target_gets_tight_budget():
+    stats = stats_for([0.05] * 50)
+    connect, read = compute_timeouts(stats)
+    assert connect == latency.DEFAULT_MIN_TIMEOUT
+    assert read == latency.DEFAULT_MIN_TIMEOUT
+
+
+def test_occasional_timeout_does_not_grow_budget():
+    # Timeouts never enter the stats; a single one in the window isn't enough to grow
+    stats = stats_for([0.05] * 50)
+    outcomes = [1] + [0] * (latency.OUTCOME_WINDOW - 1)
+    previous = None
+    for _ in range(20):
+        _, previous = compute_timeouts(stats, previous_read=previous, outcomes=outcomes)
+    assert previous == latency.DEFAULT_MIN_TIMEOUT
+
+
+def test_frequent_timeouts_grow_budget_step_by_step():
+    stats = stats_for([0.05] * 200)
+    outcomes = [1, 1] + [0] * (latency.OUTCOME_WINDOW - 2)
+    _, read = compute_timeouts(stats, previous_read=1.0, outcomes=outcomes)
+    assert read == 1.0 * latency.MAX_GROWTH
+
+    _, read = compute_timeouts(stats, previous_read=8.0, outcomes=[1] * latency.OUTCOME_WINDOW)
+    assert read == latency.DEFAULT_MAX_TIMEOUT
+
+
+def test_budget_holds_once_host_answers_again():
+    stats = stats_for([0.05] * 200)
+    outcomes = [0, 1, 1] + [0] * (latency.OUTCOME_WINDOW - 3)
+    _, read = compute_timeouts(stats, previous_read=2.25, outcomes=outcomes)
+    assert read == 2.25
+
+
+def test_fast_host_that_slows_down_recovers():
+    """A 50ms host starts answering in 1.5s; deliveries must get through again."""
+    samples = ["0.05"] * latency.SAMPLE_WINDOW
+    outcomes = [0] * latency.OUTCOME_WINDOW
+    previous = None
+    answered = []
+    for _ in range(60):
+        _, previous = compute_timeouts(
+            _latency_stats(samples),
+            previous_read=previous,
+            outcomes=outcomes
+        )
+        timed_out = previous <= 1.5
+        if not timed_out:
+            samples = ["1.5"] + samples[:latency.SAMPLE_WINDOW - 1]
+        outcomes = [int(timed_out)] + outcomes[:latency.OUTCOME_WINDOW - 1]
+        answered.append(not timed_out)
+
+    # Fewer timeouts in a row than a delivery has retries
+    assert answered.index(True) < 5
+    # Once recovered the budget settles above the new latency and stays there
+    assert all(answered[answered.index(True):])
+    assert previous == 1.5 * latency.READ_HEADROOM
+
+
+def test_budget_key_depends_on_bounds():
+    assert latency._budget_key("example.com", 1.0, 2.0) != latency._budget_key("example.com", 1.0, 30.0)
+
+
+def test_slow_target_budget_grows_gradually():
+    stats = stats_for([4.0] * 50)
+    _, read = compute_timeouts(stats, max_timeout=30, previous_read=1.0)
+    assert read == 1.0 * latency.MAX_GROWTH
+
+    budgets = []
+    previous = 1.0
+    for _ in range(10):
+        _, previous = compute_timeouts(stats, max_timeout=30, previous_read=previous)
+        budgets.append(previous)
+    assert budgets[-1] == 4.0 * latency.READ_HEADROOM
+    assert all(b <= a * latency.MAX_GROWTH for a, b in zip([1.0] + budgets, budgets))
+
+
+def test_budget_shrinks_immediately():
+    stats = stats_for([0.05] * 50)
+    _, read = compute_timeouts(stats, previous_read=10.0)
+    assert read == latency.DEFAULT_MIN_TIMEOUT
+
+
+def test_budget_respects_subscription_bounds():
+    stats = stats_for([20.0] * 50)
+    connect, read = compute_timeouts(stats, min_timeout=2, max_timeout=12)
+    assert read == 12
+    assert connect == latency.MAX_CONNECT_TIMEOUT
@@ -0,0 +1,36 @@
+import pytest
+from pydantic import ValidationError
+
+from app import schemas
+
+
+def test_create_accepts_valid_timeout_bounds():
+    sub = schemas.SubscriptionCreate(target_url="http://example.com/hook", min_timeout=0.5, max_timeout=15)
+    assert (sub.min_timeout, sub.max_timeout) == (0.5, 15)
+
+
+def test_create_rejects_min_above_max():
+    with pytest.raises(ValidationError):
+        schemas.SubscriptionCreate(target_url="http://example.com/hook", min_timeout=5, max_timeout=2)
+
+
+def test_create_rejects_min_above_default_max():
+    with pytest.raises(ValidationError):
+        schemas.SubscriptionCreate(target_url="http://example.com/hook", min_timeout=30)
+
+
+def test_update_rejects_min_above_max():
+    with pytest.raises(ValidationError):
+        schemas.SubscriptionUpdate(min_timeout=5, max_timeout=2)
+
+
+def test_update_allows_single_bound():
+    # Checked against the stored bound by the route instead
+    assert schemas.SubscriptionUpdate(min_timeout=30).min_timeout == 30
+
+
+def test_check_timeout_bounds_uses_defaults():
+    schemas.check_timeout_bounds(None, None)
+    schemas.check_timeout_bounds(12, 20)
+    with pytest.raises(ValueError):
+        schemas.check_timeout_bounds(12, None)